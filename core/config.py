@@ -96,6 +96,14 @@ class Config:
     SMALL_PAD = 2
     MED_PAD = 3
 
+    # -------------------------
+    # Cache de PDFs gerados (em memória, por digest das entradas)
+    # -------------------------
+    # Quantos PDFs manter; 0 (padrão) desativa. Opcional: um PDF servido do cache é
+    # byte a byte o da primeira geração (mesmos CreationDate e /ID), e alterar
+    # atributos do Config em tempo de execução não invalida o cache (só trocar o objeto).
+    PDF_CACHE_SIZE = 0
+
     # -------------------------
     # Outros (mantidos por compatibilidade)
     # -------------------------
@@ -1,10 +1,12 @@
 import sqlite3
-import json
 from datetime import datetime
 from flask import g
 from contextlib import contextmanager
 import os
 
+# mesmo decodificador das normalizações (orjson com fallback para json)
+from core.normalizers import _loads
+
 class DatabaseManager:
     def __init__(self, app):
         self.app = app
@@ -159,7 +161,7 @@ class DatabaseManager:
             parsed = []
             if isinstance(raw_val, str):
                 try:
-                    parsed = json.loads(raw_val)
+                    parsed = _loads(raw_val)
                 except Exception:
                     parsed = []
             elif isinstance(raw_val, list):
@@ -167,7 +169,7 @@ class DatabaseManager:
             else:
                 try:
                     if isinstance(raw_val, (bytes, bytearray)):
-                        parsed = json.loads(raw_val.decode('utf-8'))
+                        parsed = _loads(raw_val.decode('utf-8'))
                     else:
                         parsed = []
                 except Exception:
@@ -179,7 +181,7 @@ class DatabaseManager:
             parsed = []
             if isinstance(raw_val, str):
                 try:
-                    parsed = json.loads(raw_val)
+                    parsed = _loads(raw_val)
                 except Exception:
                     parsed = []
             elif isinstance(raw_val, list):
@@ -187,7 +189,7 @@ class DatabaseManager:
             else:
                 try:
                     if isinstance(raw_val, (bytes, bytearray)):
-                        parsed = json.loads(raw_val.decode('utf-8'))
+                        parsed = _loads(raw_val.decode('utf-8'))
                     else:
                         parsed = []
                 except Exception:
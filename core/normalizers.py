@@ -1,12 +1,88 @@
 # core/normalizers.py
+import copy
+import hashlib
 import json
 import re
-from typing import Dict, Tuple, Any, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple, Any, List, Optional, Sequence
 from datetime import datetime
 
-TIME_SEPARATORS = ['às', 'as', 'AS', 'ÀS', '-', '–', '—', '/', ' a ']  # possíveis separadores de período
+try:
+    # orjson é bem mais rápido para os arrays de atividades em string
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# inteiros acima de 64 bits viram float no orjson (sem erro): com 19+ dígitos seguidos
+# o texto vai direto para o json padrão
+_LONG_DIGITS = re.compile(r'[0-9]{19,}')
+_LONG_DIGITS_B = re.compile(rb'[0-9]{19,}')
+
+
+def _loads(raw):
+    """
+    json.loads com orjson quando disponível. O orjson é mais estrito (recusa NaN/Infinity)
+    e perde precisão em inteiros grandes; nesses casos vale o json padrão, como antes.
+    """
+    if orjson is not None and isinstance(raw, (str, bytes, bytearray)):
+        long_digits = _LONG_DIGITS if isinstance(raw, str) else _LONG_DIGITS_B
+        if not long_digits.search(raw):
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(raw)
 
-def _pick_first(d: Dict[str, Any], keys: List[str], default=''):
+TIME_SEPARATORS = ['às', 'as', 'AS', 'ÀS', '-', '–', '—', '/', ' a ']  # possíveis separadores de período
+# valores textuais aceitos como verdadeiro (variações de caixa mais comuns já incluídas)
+_TRUTHY = frozenset({'1', 'true', 't', 'yes', 'on', 'True', 'TRUE', 'T', 'YES', 'ON'})
+
+# (campo de saída, chaves aceitas na entrada) para cada equipamento
+_EQ_KEYS = (
+    ('equipamento', ('equipamento', 'EQUIPAMENTO', 'equipment', 'name')),
+    ('fabricante', ('fabricante', 'FABRICANTE', 'manufacturer')),
+    ('modelo', ('modelo', 'MODELO', 'model')),
+    ('numero_serie', ('numero_serie', 'NUMERO_SERIE', 'serial_number', 'sn')),
+)
+
+# formatos aceitos em _try_parse_datetime (equivalentes aos antigos strptime, na mesma ordem):
+# dd/mm/aaaa, aaaa-mm-dd e dd-mm-aaaa, cada um com hora opcional HH:MM[:SS].
+# Cada entrada guarda o regex e os índices dos grupos (ano, mês, dia); hora/min/seg são 4, 5 e 6.
+# Só dígitos ASCII ([0-9]): o strptime recusa dígitos Unicode em %d/%m/%H/%M/%S (mas não
+# em %Y), então textos com esses dígitos seguem pelo caminho antigo (_DATE_FMTS).
+_TIME_SUFFIX = r'(?:\s+([0-9]{1,2}):([0-9]{1,2})(?::([0-9]{1,2}))?)?'
+_DATE_PARSERS = (
+    (re.compile(r'([0-9]{1,2})/([0-9]{1,2})/([0-9]{4})' + _TIME_SUFFIX), (3, 2, 1)),
+    # %d do strptime também aceita dia com espaço à esquerda (' 2'); só alcançável aqui
+    (re.compile(r'([0-9]{4})-([0-9]{1,2})-([0-9]{1,2}| [1-9])' + _TIME_SUFFIX), (1, 2, 3)),
+    (re.compile(r'([0-9]{1,2})-([0-9]{1,2})-([0-9]{4})' + _TIME_SUFFIX), (3, 2, 1)),
+)
+_TIMESTAMP_RE = re.compile(r'\d{10,13}')
+_SEARCH_DATE_BR_RE = re.compile(r'([0-9]{2})/([0-9]{2})/([0-9]{4})')
+_SEARCH_DATE_ISO_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+_NON_ASCII_DIGIT_RE = re.compile(r'(?![0-9])\d')
+_DATE_FMTS = (
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%d-%m-%Y %H:%M:%S",
+    "%d-%m-%Y %H:%M",
+    "%d-%m-%Y",
+)
+
+# campos de saída de normalize_activity, na ordem em que aparecem no dict
+_ACTIVITY_KEYS = (
+    'DATA_DT', 'DATA', 'HORA', 'HORA_INICIO', 'HORA_FIM', 'TIPO', 'KM', 'MOTIVO',
+    'ORIGEM', 'DESTINO', 'DESCRICAO', 'TECNICO1', 'TECNICO2', 'TECNICO1_FULL',
+    'TECNICO2_FULL', 'KM_BLOQUEADO',
+)
+
+def _pick_first(d: Dict[str, Any], keys: Sequence[str], default=''):
     for k in keys:
         if k in d and d[k] is not None:
             return d[k]
@@ -84,7 +160,7 @@ def _try_parse_datetime(value: Any) -> Optional[datetime]:
         return None
 
     # timestamps numéricos (10 ou 13 dígitos)
-    if re.fullmatch(r'^\d{10,13}$', v):
+    if _TIMESTAMP_RE.fullmatch(v):
         try:
             if len(v) == 13:
                 ts = int(v) / 1000.0
@@ -100,24 +176,44 @@ def _try_parse_datetime(value: Any) -> Optional[datetime]:
     except Exception:
         pass
 
-    fmts = [
-        "%d/%m/%Y %H:%M:%S",
-        "%d/%m/%Y %H:%M",
-        "%d/%m/%Y",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%d",
-        "%d-%m-%Y %H:%M:%S",
-        "%d-%m-%Y %H:%M",
-        "%d-%m-%Y",
-    ]
-    for f in fmts:
+    # dígitos não ASCII: regras exatas do strptime, como antes
+    if _NON_ASCII_DIGIT_RE.search(v):
+        return _try_parse_datetime_strptime(v)
+
+    # formatos fixos: regex pré-compilado + construtor direto (sem strptime/exceções no caminho feliz)
+    for pat, (yi, mi, di) in _DATE_PARSERS:
+        m = pat.fullmatch(v)
+        if m:
+            try:
+                return datetime(int(m[yi]), int(m[mi]), int(m[di]),
+                                int(m[4] or 0), int(m[5] or 0), int(m[6] or 0))
+            except ValueError:
+                continue
+
+    # fallback: procurar por pattern de data na string
+    m = _SEARCH_DATE_BR_RE.search(v)
+    if m:
+        try:
+            return datetime(int(m[3]), int(m[2]), int(m[1]))
+        except ValueError:
+            pass
+    m2 = _SEARCH_DATE_ISO_RE.search(v)
+    if m2:
+        try:
+            return datetime(int(m2[1]), int(m2[2]), int(m2[3]))
+        except ValueError:
+            pass
+
+    return None
+
+def _try_parse_datetime_strptime(v: str) -> Optional[datetime]:
+    """Caminho original (strptime) de _try_parse_datetime, para textos com dígitos não ASCII."""
+    for f in _DATE_FMTS:
         try:
             return datetime.strptime(v, f)
         except Exception:
             continue
 
-    # fallback: procurar por pattern de data na string
     m = re.search(r'(\d{2}/\d{2}/\d{4})', v)
     if m:
         try:
@@ -134,10 +230,8 @@ def _try_parse_datetime(value: Any) -> Optional[datetime]:
     return None
 
 def _format_date_br(dt: datetime) -> str:
-    try:
-        return dt.strftime("%d/%m/%Y")
-    except Exception:
-        return ''
+    # formato fixo: f-string evita o parser de formato do strftime
+    return f"{dt.day:02d}/{dt.month:02d}/{dt.year:04d}"
 
 def _sanitize_description(descricao: str, origem: str, destino: str, motivo: str, tipo: str) -> str:
     """
@@ -167,7 +261,8 @@ def normalize_activity(raw: Dict[str, Any]) -> Dict[str, Any]:
     Normaliza uma entrada de atividade. Mantém compatibilidade com Pydantic
     esperando DATA como string (DD/MM/YYYY). Adiciona DATA_DT com datetime quando possível.
     """
-    a: Dict[str, Any] = {}
+    # dict já criado com todas as chaves: evita redimensionamentos a cada atribuição
+    a: Dict[str, Any] = dict.fromkeys(_ACTIVITY_KEYS, '')
 
     # DATA: tentamos obter datetime; armazenamos string em a['DATA'] (compatível com Pydantic)
     raw_date = _pick_first(raw, ['DATA', 'data', 'Data', 'DATA_HORA', 'data_hora', 'datetime', 'timestamp', 'created_at'])
@@ -233,13 +328,11 @@ def normalize_activity(raw: Dict[str, Any]) -> Dict[str, Any]:
     # KM_BLOQUEADO normalização booleana
     km_blocked_raw = _pick_first(raw, ['KM_BLOQUEADO', 'km_bloqueado', 'KM_BLOCKED', 'kmBlocked', 'blocked_km', 'KMBLOCKED']) or False
     if isinstance(km_blocked_raw, str):
-        km_blocked = km_blocked_raw.strip().lower() in ('1', 'true', 't', 'yes', 'on')
-    elif isinstance(km_blocked_raw, (int, float)):
-        km_blocked = bool(km_blocked_raw)
-    elif isinstance(km_blocked_raw, bool):
-        km_blocked = km_blocked_raw
+        s = km_blocked_raw.strip()
+        km_blocked = s in _TRUTHY or s.lower() in _TRUTHY
     else:
-        km_blocked = False
+        # bool é subclasse de int: coberto pelo mesmo ramo
+        km_blocked = bool(km_blocked_raw) if isinstance(km_blocked_raw, (int, float)) else False
     a['KM_BLOQUEADO'] = km_blocked
 
     return a
@@ -250,7 +343,7 @@ def normalize_equipments(raw_e) -> List[Dict[str, Any]]:
     parsed = []
     if isinstance(raw_e, str):
         try:
-            parsed = json.loads(raw_e)
+            parsed = _loads(raw_e)
         except Exception:
             parsed = []
     elif isinstance(raw_e, (list, tuple)):
@@ -258,17 +351,11 @@ def normalize_equipments(raw_e) -> List[Dict[str, Any]]:
     else:
         parsed = []
 
-    out = []
-    for item in parsed:
-        if not isinstance(item, dict):
-            continue
-        eq = {}
-        eq['equipamento'] = _pick_first(item, ['equipamento', 'EQUIPAMENTO', 'equipment', 'name']) or ''
-        eq['fabricante'] = _pick_first(item, ['fabricante', 'FABRICANTE', 'manufacturer']) or ''
-        eq['modelo'] = _pick_first(item, ['modelo', 'MODELO', 'model']) or ''
-        eq['numero_serie'] = _pick_first(item, ['numero_serie', 'NUMERO_SERIE', 'serial_number', 'sn']) or ''
-        out.append(eq)
-    return out
+    return [
+        {dst: _pick_first(item, src) or '' for dst, src in _EQ_KEYS}
+        for item in parsed
+        if isinstance(item, dict)
+    ]
 
 def normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(payload, dict):
@@ -322,7 +409,7 @@ def normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
         parsed = []
         if isinstance(acts_raw, str):
             try:
-                parsed = json.loads(acts_raw)
+                parsed = _loads(acts_raw)
             except Exception:
                 parsed = []
         elif isinstance(acts_raw, (list, tuple)):
@@ -330,18 +417,14 @@ def normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
         else:
             if isinstance(acts_raw, (bytes, bytearray)):
                 try:
-                    parsed = json.loads(acts_raw.decode('utf-8'))
+                    parsed = _loads(acts_raw)
                 except Exception:
                     parsed = []
             else:
                 parsed = []
 
         if isinstance(parsed, list):
-            for a in parsed:
-                if isinstance(a, dict):
-                    activities_list.append(normalize_activity(a))
-                else:
-                    activities_list.append({})
+            activities_list = [normalize_activity(a) if isinstance(a, dict) else {} for a in parsed]
         else:
             activities_list = []
 
@@ -371,6 +454,41 @@ def normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     return normalized
 
+# cache dos payloads normalizados, indexado pelo hash dos bytes crus do corpo
+_PAYLOAD_CACHE_MAXSIZE = 64
+_payload_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_payload_cache_lock = threading.Lock()
+
+def normalize_payload_cached(raw_body, payload=None) -> Dict[str, Any]:
+    """
+    Variante de normalize_payload com memoização para payloads repetidos
+    (ex.: reenvio do mesmo formulário). A chave é o BLAKE2b dos bytes crus do
+    corpo (request.get_data()), sem reserializar. `payload` é o dict já
+    decodificado, se o chamador tiver; senão o corpo é decodificado aqui.
+    Devolve sempre uma cópia independente.
+    """
+    if isinstance(raw_body, str):
+        raw_body = raw_body.encode('utf-8')
+    if not isinstance(raw_body, (bytes, bytearray)) or not raw_body:
+        # sem corpo cru para chavear -> caminho sem cache
+        return normalize_payload(payload if payload is not None else raw_body)
+    key = hashlib.blake2b(raw_body, digest_size=16).digest()
+
+    with _payload_cache_lock:
+        cached = _payload_cache.get(key)
+        if cached is not None:
+            _payload_cache.move_to_end(key)
+            return copy.deepcopy(cached)
+
+    if payload is None:
+        payload = _loads(raw_body)
+    normalized = normalize_payload(payload)
+    with _payload_cache_lock:
+        _payload_cache[key] = copy.deepcopy(normalized)
+        while len(_payload_cache) > _PAYLOAD_CACHE_MAXSIZE:
+            _payload_cache.popitem(last=False)
+    return normalized
+
 def ensure_upper_safe(s):
     try:
         return str(s or '').upper()
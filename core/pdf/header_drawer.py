@@ -2,9 +2,26 @@
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
 from pathlib import Path
+from bisect import bisect_right
+from itertools import accumulate
+from functools import lru_cache
 import io
 
+CONTACT_LINE = "PRONAV COMÉRCIO E SERVIÇOS LTDA.   |   CNPJ: 54.284.063/0001-46   |   Tel.: (22) 2141-2458   |   Cel.: (22) 99221-1893   |   service@pronav.com.br   |   www.pronav.com.br"
+LABELS_LEFT = ("NAVIO", "CONTATO", "LOCAL")
+LABELS_RIGHT = ("CLIENTE", "OBRA", "OS")
+
+@lru_cache(maxsize=4)
+def _logo_reader(src):
+    """
+    ImageReader do logo compartilhado entre HeaderDrawers/PDFServices do processo.
+    `src` são os bytes do logo (mesmo objeto enquanto o arquivo não muda) ou um caminho.
+    """
+    return ImageReader(io.BytesIO(src) if isinstance(src, bytes) else src)
+
+
 class HeaderDrawer:
     """
     HeaderDrawer: lê configurações de fonte do `config` (se fornecido) e aplica
@@ -22,6 +39,8 @@ class HeaderDrawer:
         self.BASE_TITLE_FONT_SIZE = float(base_title_font_size or 0.0)
         self.LINE_WIDTH = float(line_width or 0.6)
         self.GRAY = gray_color
+        # HexColor analisa a string a cada chamada: cria uma vez só
+        self._gray333 = colors.HexColor('#333333')
 
         # pagina/layout valores
         self.MARG = margin
@@ -56,6 +75,100 @@ class HeaderDrawer:
         self.HEADER_VALUE_FONT_SIZE = _cfg('HEADER_VALUE_FONT_SIZE', -1.0)
         self.HEADER_VALUE_MIN_SIZE = _cfg('HEADER_VALUE_MIN_SIZE', 7.0)
 
+        # larguras por caractere, por (fonte, tamanho), usadas no truncamento
+        self._char_widths = {}
+        # logo já decodificado e posicionado, por bytes (ou caminho do LOGO_PATH)
+        self._logo_cache = {}
+        # path das linhas do header, por top_y (depende só de pagesize/topMargin)
+        self._frame_paths = {}
+        # valores do relatório atual (preenchidos por prepare_report)
+        self._values_for = None
+        self._values_left = ()
+        self._values_right = ()
+
+        self._setup_geometry()
+
+    def _setup_geometry(self):
+        """
+        Pré-calcula tudo o que não depende da página (larguras/posições das colunas
+        e tamanhos de fonte resolvidos). Em draw_header só top_y/bottom_y variam.
+        """
+        left_x = self.MARG
+        right_x = self.MARG + self.usable_w
+        logo_x1 = left_x + self.square_side
+
+        sep_x1 = logo_x1
+        sep_x2 = right_x
+
+        left_increase = 1.30
+        inner_label_w = 0.8 * inch * left_increase
+        inner_val_w_left = 2.2 * inch * left_increase
+        inner_label_w2 = 0.5 * inch
+        total_center = sep_x2 - sep_x1
+        inner_val_w_right = total_center - (inner_label_w + inner_val_w_left + inner_label_w2)
+
+        min_right = 0.75 * inch
+        if inner_val_w_right < min_right:
+            deficit = min_right - inner_val_w_right
+            reduce_each = deficit / 2.0
+            inner_val_w_left = max(0.5 * inch, inner_val_w_left - reduce_each)
+            inner_label_w = max(0.4 * inch, inner_label_w - reduce_each)
+            inner_val_w_right = total_center - (inner_label_w + inner_val_w_left + inner_label_w2)
+            inner_val_w_right = max(inner_val_w_right, min_right)
+
+        col_x0 = sep_x1
+        col_x1 = col_x0 + inner_label_w
+        col_x2 = col_x1 + inner_val_w_left
+        col_x3 = col_x2 + inner_label_w2
+        col_x4 = col_x3 + inner_val_w_right
+        self._geom = (left_x, right_x, logo_x1, col_x0, col_x2, col_x3, col_x4)
+
+        # tamanhos de fonte resolvidos (dependem só do config)
+        self.contact_font_size = self._resolve_font(self.HEADER_CONTACT_FONT_SIZE, self.HEADER_CONTACT_MIN_SIZE, self.BASE_TITLE_FONT_SIZE)
+        self.title_font_size = self._resolve_font(self.HEADER_TITLE_FONT_SIZE, self.HEADER_TITLE_MIN_SIZE, self.BASE_TITLE_FONT_SIZE)
+        self.logo_fallback_font_size = self._resolve_font(self.HEADER_LABEL_FONT_SIZE, self.HEADER_LABEL_MIN_SIZE, 10)
+        self.label_font = self._resolve_font(self.HEADER_LABEL_FONT_SIZE, self.HEADER_LABEL_MIN_SIZE, self.BASE_TITLE_FONT_SIZE)
+        self.value_font = self._resolve_font(self.HEADER_VALUE_FONT_SIZE, self.HEADER_VALUE_MIN_SIZE, self.label_font)
+
+        # rótulos fixos: larguras, versões já truncadas e divisor comum calculados uma vez
+        self._label_widths = {txt: pdfmetrics.stringWidth(txt, self.FONT_BOLD, self.label_font)
+                              for txt in LABELS_LEFT + LABELS_RIGHT}
+        label_x = col_x0 + 2
+        label_max_w = max(8, col_x2 - label_x - 6)
+        self._labels_left_fit = tuple(self._truncate(txt, self.FONT_BOLD, self.label_font, label_max_w)
+                                      for txt in LABELS_LEFT)
+        # divisor vertical do bloco esquerdo alinhado ao rótulo "CONTATO"
+        self._divider_x_common = col_x0 + 2 + self._label_widths["CONTATO"] + 2.0
+
+        # segmentos de linha do header (x0, dy0, x1, dy1), com y relativo a top_y;
+        # em draw_header viram um único path com um só operador de traço
+        hh = self.header_height_base
+        eps = 0.4
+        d_rows = [-self.header_row0]
+        for _ in range(3):
+            d_rows.append(d_rows[-1] - self.header_row)
+        d_row0, d_row3 = d_rows[0], d_rows[3]
+
+        def clamp_x(x):
+            return max(left_x, min(right_x, x))
+
+        segs = [
+            (left_x - eps, eps, right_x + eps, eps),
+            (left_x - eps, -hh - eps, right_x + eps, -hh - eps),
+            (left_x - eps, -hh - eps, left_x - eps, eps),
+            (right_x + eps, -hh - eps, right_x + eps, eps),
+        ]
+        segs.extend((logo_x1, d, right_x, d) for d in d_rows)
+        # baseline inferior do header (igual ao y_row3)
+        segs.append((left_x, d_row3, right_x, d_row3))
+        dividers = [self._divider_x_common,
+                    clamp_x(col_x2 + 2.0),
+                    clamp_x(col_x3 + 4.0),
+                    clamp_x(self._divider_x_common)]
+        segs.extend((x, d_row3, x, d_row0) for x in dict.fromkeys(dividers))
+        self._static_segments = tuple(segs)
+        self._divider_x_clamped = dividers[3]
+
     def _resolve_font(self, override_size, min_size, base_size):
         """
         Resolve política de prioridade:
@@ -76,130 +189,145 @@ class HeaderDrawer:
             bs = float(min_size)
         return int(max(min_size, round(bs)))
 
+    def _truncate(self, text, font_name, font_size, max_w):
+        """
+        Trunca `text` com reticências para caber em max_w (mesma regra do antigo laço
+        que removia um caractere por vez), usando somas prefixadas das larguras por
+        caractere + bisect em vez de um stringWidth por caractere removido.
+        """
+        if pdfmetrics.stringWidth(text, font_name, font_size) <= max_w:
+            return text
+        widths = self._char_widths.get((font_name, font_size))
+        if widths is None:
+            widths = self._char_widths[(font_name, font_size)] = {}
+        for ch in text:
+            if ch not in widths:
+                widths[ch] = pdfmetrics.stringWidth(ch, font_name, font_size)
+        if '…' not in widths:
+            widths['…'] = pdfmetrics.stringWidth('…', font_name, font_size)
+        cum = list(accumulate((widths[ch] for ch in text), initial=0.0))
+        # maior k tal que largura(text[:k]) + largura('…') <= max_w (k < len(text))
+        k = min(bisect_right(cum, max_w - widths['…']) - 1, len(text) - 1)
+        text = text[:max(0, k)]
+        return (text + '…') if text else ''
+
+    def prepare_report(self, report_request, ensure_upper_safe):
+        """
+        Calcula uma vez por relatório os valores exibidos no header
+        (NAVIO/CONTATO/LOCAL e CLIENTE/OBRA/OS), já em maiúsculas.
+        """
+        self._values_left = (
+            ensure_upper_safe(getattr(report_request, 'NAVIO', '') or ''),
+            ensure_upper_safe(getattr(report_request, 'CONTATO', '') or ''),
+            ' - '.join(filter(None, [
+                ensure_upper_safe(getattr(report_request, 'LOCAL', '') or ''),
+                ensure_upper_safe(getattr(report_request, 'CIDADE', '') or ''),
+                ensure_upper_safe(getattr(report_request, 'ESTADO', '') or '')
+            ]))
+        )
+        self._values_right = (
+            ensure_upper_safe(getattr(report_request, 'CLIENTE', '') or ''),
+            ensure_upper_safe(getattr(report_request, 'OBRA', '') or ''),
+            ensure_upper_safe(getattr(report_request, 'OS', '') or '')
+        )
+        self._values_for = report_request
+        return self._values_left, self._values_right
+
+    def _get_logo(self, key, src):
+        """
+        Retorna (reader, logo_x, dy, logo_w, logo_h) do logo, decodificado e
+        dimensionado uma única vez. `dy` é relativo à base do header (y_row3).
+        """
+        entry = self._logo_cache.get(key)
+        if entry is None:
+            img_reader = _logo_reader(src)
+            iw, ih = img_reader.getSize()
+            pad = 6.0
+            max_w = max(1.0, self.square_side - 2 * pad)
+            max_h = max(1.0, self.header_height_base - 2 * pad)
+            ratio_w = max_w / iw if iw > 0 else 1.0
+            ratio_h = max_h / ih if ih > 0 else 1.0
+            ratio = min(1.0, ratio_w, ratio_h)
+            logo_w = iw * ratio
+            logo_h = ih * ratio
+            if logo_w > max_w:
+                factor = max_w / logo_w
+                logo_w *= factor
+                logo_h *= factor
+            logo_x = self._geom[0] + (self.square_side - logo_w) / 2.0
+            dy = (self.header_height_base - logo_h) / 2.0
+            entry = self._logo_cache[key] = (img_reader, logo_x, dy, logo_w, logo_h)
+        return entry
+
     def draw_header(self, canvas, doc_local, logo_bytes, report_request, ensure_upper_safe):
-        MARG = self.MARG
-        usable_w = self.usable_w
         PAGE_W = self.PAGE_W
         header_height_base = self.header_height_base
         header_row0 = self.header_row0
         header_row = self.header_row
         square_side = self.square_side
+        left_x, right_x, logo_x1, col_x0, col_x2, col_x3, col_x4 = self._geom
 
         canvas.saveState()
         canvas.setLineJoin(1)
         canvas.setLineWidth(self.LINE_WIDTH)
         canvas.setStrokeColor(colors.black)
 
-        left_x = MARG
-        right_x = MARG + usable_w
         top_y = doc_local.pagesize[1] - doc_local.topMargin
         bottom_y = top_y - header_height_base
 
         logo_x0 = left_x
-        logo_x1 = left_x + square_side
 
         sep_x1 = logo_x1
         sep_x2 = right_x
 
-        eps = 0.4
-        canvas.line(left_x - eps, top_y + eps, right_x + eps, top_y + eps)
-        canvas.line(left_x - eps, bottom_y - eps, right_x + eps, bottom_y - eps)
-        canvas.line(left_x - eps, bottom_y - eps, left_x - eps, top_y + eps)
-        canvas.line(right_x + eps, bottom_y - eps, right_x + eps, top_y + eps)
-
-        try:
-            canvas.rect(logo_x0, bottom_y, square_side, header_height_base, stroke=1, fill=0)
-        except Exception:
-            pass
-
         y_top = top_y
         y_row0 = y_top - header_row0
         y_row1 = y_row0 - header_row
         y_row2 = y_row1 - header_row
         y_row3 = y_row2 - header_row
 
-        canvas.line(logo_x1, y_row0, right_x, y_row0)
-        canvas.line(logo_x1, y_row1, right_x, y_row1)
-        canvas.line(logo_x1, y_row2, right_x, y_row2)
-        canvas.line(logo_x1, y_row3, right_x, y_row3)
-
-        left_increase = 1.30
-        inner_label_w = 0.8 * inch * left_increase
-        inner_val_w_left = 2.2 * inch * left_increase
-        inner_label_w2 = 0.5 * inch
-        total_center = sep_x2 - sep_x1
-        inner_val_w_right = total_center - (inner_label_w + inner_val_w_left + inner_label_w2)
-
-        min_right = 0.75 * inch
-        if inner_val_w_right < min_right:
-            deficit = min_right - inner_val_w_right
-            reduce_each = deficit / 2.0
-            inner_val_w_left = max(0.5 * inch, inner_val_w_left - reduce_each)
-            inner_label_w = max(0.4 * inch, inner_label_w - reduce_each)
-            inner_val_w_right = total_center - (inner_label_w + inner_val_w_left + inner_label_w2)
-            inner_val_w_right = max(inner_val_w_right, min_right)
-
-        col0_w, col1_w, col2_w, col3_w = inner_label_w, inner_val_w_left, inner_label_w2, inner_val_w_right
-        col_x0 = sep_x1
-        col_x1 = col_x0 + col0_w
-        col_x2 = col_x1 + col1_w
-        col_x3 = col_x2 + col2_w
-        col_x4 = col_x3 + col3_w
-
-        # baseline inferior do header (igual ao y_row3)
-        canvas.line(left_x, y_row3, right_x, y_row3)
-
-        # --- CONTACT LINE (pequeno texto central) ---
+        # gray title background (antes das linhas, que ficam por cima)
         try:
-            contact_line = "PRONAV COMÉRCIO E SERVIÇOS LTDA.   |   CNPJ: 54.284.063/0001-46   |   Tel.: (22) 2141-2458   |   Cel.: (22) 99221-1893   |   service@pronav.com.br   |   www.pronav.com.br"
-            contact_font_size = self._resolve_font(self.HEADER_CONTACT_FONT_SIZE, self.HEADER_CONTACT_MIN_SIZE, self.BASE_TITLE_FONT_SIZE)
-            contact_y = top_y + (0.05 * inch)
-            canvas.setFont(self.FONT_REGULAR, contact_font_size)
-            canvas.setFillColor(colors.HexColor('#333333'))
-            canvas.drawCentredString(PAGE_W / 2.0, contact_y, contact_line)
+            canvas.setFillColor(self.GRAY)
+            canvas.rect(sep_x1, y_row0, (sep_x2 - sep_x1), header_row0, stroke=0, fill=1)
             canvas.setFillColor(colors.black)
         except Exception:
             pass
 
-        # gray title background
+        # bordas, quadro do logo, linhas das fileiras e divisores num único path,
+        # montado na primeira página e reaproveitado nas seguintes
+        path = self._frame_paths.get(top_y)
+        if path is None:
+            path = canvas.beginPath()
+            for x0, dy0, x1, dy1 in self._static_segments:
+                path.moveTo(x0, top_y + dy0)
+                path.lineTo(x1, top_y + dy1)
+            path.rect(logo_x0, bottom_y, square_side, header_height_base)
+            self._frame_paths[top_y] = path
+        canvas.drawPath(path, stroke=1, fill=0)
+
+        # --- CONTACT LINE (pequeno texto central) ---
         try:
-            canvas.setFillColor(self.GRAY)
-            canvas.rect(sep_x1, y_row0, (sep_x2 - sep_x1), header_row0, stroke=0, fill=1)
+            contact_y = top_y + (0.05 * inch)
+            canvas.setFont(self.FONT_REGULAR, self.contact_font_size)
+            canvas.setFillColor(self._gray333)
+            canvas.drawCentredString(PAGE_W / 2.0, contact_y, CONTACT_LINE)
             canvas.setFillColor(colors.black)
         except Exception:
             pass
 
         # --- HEADER TITLE ("RELATÓRIO DE SERVIÇO") ---
-        title_font_size = self._resolve_font(self.HEADER_TITLE_FONT_SIZE, self.HEADER_TITLE_MIN_SIZE, self.BASE_TITLE_FONT_SIZE)
-        canvas.setFont(self.FONT_BOLD, title_font_size)
+        canvas.setFont(self.FONT_BOLD, self.title_font_size)
         canvas.drawCentredString((sep_x1 + sep_x2) / 2.0, y_row0 + (header_row0 / 2.0) - 3, "RELATÓRIO DE SERVIÇO")
 
-        canvas.setStrokeColor(colors.black)
-        canvas.setLineWidth(self.LINE_WIDTH)
-        canvas.line(sep_x1, y_row0, right_x, y_row0)
-
         # --- draw logo (unchanged) ---
         logo_drawn = False
         try:
             if logo_bytes:
                 try:
-                    img_reader = ImageReader(io.BytesIO(logo_bytes))
-                    iw, ih = img_reader.getSize()
-                    pad = 6.0
-                    max_w = max(1.0, square_side - 2 * pad)
-                    max_h = max(1.0, header_height_base - 2 * pad)
-                    ratio_w = max_w / iw if iw > 0 else 1.0
-                    ratio_h = max_h / ih if ih > 0 else 1.0
-                    ratio = min(1.0, ratio_w, ratio_h)
-                    logo_w = iw * ratio
-                    logo_h = ih * ratio
-                    if logo_w > max_w:
-                        factor = max_w / logo_w
-                        logo_w *= factor
-                        logo_h *= factor
-                    logo_x = logo_x0 + (square_side - logo_w) / 2.0
-                    logo_y = y_row3 + (header_height_base - logo_h) / 2.0
-                    canvas.drawImage(img_reader, logo_x, logo_y, width=logo_w, height=logo_h, preserveAspectRatio=True, mask='auto')
+                    # bytes cacheiam o próprio hash: a busca no cache é O(1) a partir da 2ª página
+                    img_reader, logo_x, dy, logo_w, logo_h = self._get_logo(logo_bytes, bytes(logo_bytes))
+                    canvas.drawImage(img_reader, logo_x, y_row3 + dy, width=logo_w, height=logo_h, preserveAspectRatio=True, mask='auto')
                     logo_drawn = True
                 except Exception:
                     logo_drawn = False
@@ -207,27 +335,16 @@ class HeaderDrawer:
                 lp = getattr(self.config, 'LOGO_PATH', None)
                 if lp and isinstance(lp, str):
                     try:
-                        pth = Path(lp)
-                        if not pth.is_absolute():
-                            pth = Path(__file__).resolve().parent / pth
-                        if pth.exists():
-                            img_reader = ImageReader(str(pth))
-                            iw, ih = img_reader.getSize()
-                            pad = 6.0
-                            max_w = max(1.0, square_side - 2 * pad)
-                            max_h = max(1.0, header_height_base - 2 * pad)
-                            ratio_w = max_w / iw if iw > 0 else 1.0
-                            ratio_h = max_h / ih if ih > 0 else 1.0
-                            ratio = min(1.0, ratio_w, ratio_h)
-                            logo_w = iw * ratio
-                            logo_h = ih * ratio
-                            if logo_w > max_w:
-                                factor = max_w / logo_w
-                                logo_w *= factor
-                                logo_h *= factor
-                            logo_x = logo_x0 + (square_side - logo_w) / 2.0
-                            logo_y = y_row3 + (header_height_base - logo_h) / 2.0
-                            canvas.drawImage(img_reader, logo_x, logo_y, width=logo_w, height=logo_h, preserveAspectRatio=True, mask='auto')
+                        entry = self._logo_cache.get(('path', lp))
+                        if entry is None:
+                            pth = Path(lp)
+                            if not pth.is_absolute():
+                                pth = Path(__file__).resolve().parent / pth
+                            if pth.exists():
+                                entry = self._get_logo(('path', lp), str(pth))
+                        if entry is not None:
+                            img_reader, logo_x, dy, logo_w, logo_h = entry
+                            canvas.drawImage(img_reader, logo_x, y_row3 + dy, width=logo_w, height=logo_h, preserveAspectRatio=True, mask='auto')
                             logo_drawn = True
                     except Exception:
                         logo_drawn = False
@@ -236,127 +353,65 @@ class HeaderDrawer:
 
         if not logo_drawn:
             try:
-                fsize = self._resolve_font(self.HEADER_LABEL_FONT_SIZE, self.HEADER_LABEL_MIN_SIZE, 10)
+                fsize = self.logo_fallback_font_size
                 canvas.setFont(self.FONT_BOLD, fsize)
-                canvas.setFillColor(colors.HexColor('#333333'))
+                canvas.setFillColor(self._gray333)
                 canvas.drawCentredString(logo_x0 + square_side/2.0, y_row3 + header_height_base/2.0 - (fsize/4.0), "PRONAV")
                 canvas.setFillColor(colors.black)
             except Exception:
                 pass
 
         # --- labels & values: usar tamanhos configuráveis (label/value) ---
-        labels_left = ["NAVIO", "CONTATO", "LOCAL"]
-        values_left = [
-            ensure_upper_safe(getattr(report_request, 'NAVIO', '') or ''),
-            ensure_upper_safe(getattr(report_request, 'CONTATO', '') or ''),
-            ' - '.join(filter(None, [
-                ensure_upper_safe(getattr(report_request, 'LOCAL', '') or ''),
-                ensure_upper_safe(getattr(report_request, 'CIDADE', '') or ''),
-                ensure_upper_safe(getattr(report_request, 'ESTADO', '') or '')
-            ]))
-        ]
-        labels_right = ["CLIENTE", "OBRA", "OS"]
-        values_right = [
-            ensure_upper_safe(getattr(report_request, 'CLIENTE', '') or ''),
-            ensure_upper_safe(getattr(report_request, 'OBRA', '') or ''),
-            ensure_upper_safe(getattr(report_request, 'OS', '') or '')
-        ]
+        # valores calculados uma vez por relatório (prepare_report); recalcula só se mudou
+        if self._values_for is not report_request:
+            self.prepare_report(report_request, ensure_upper_safe)
+        values_left = self._values_left
+        values_right = self._values_right
 
         rows_y = [y_row0, y_row1, y_row2, y_row3]
 
-        left_label_padding = 4
-        left_value_padding = 4
         right_label_padding = 4
         right_value_padding = 6
 
         max_width = col_x4 - col_x3 - right_value_padding
 
-        # compute unified font sizes via resolver
-        label_font = self._resolve_font(self.HEADER_LABEL_FONT_SIZE, self.HEADER_LABEL_MIN_SIZE, self.BASE_TITLE_FONT_SIZE)
-        value_font = self._resolve_font(self.HEADER_VALUE_FONT_SIZE, self.HEADER_VALUE_MIN_SIZE, label_font)
-
-        # --- calcula a posição comum do divisor vertical alinhada ao rótulo "CONTATO:" ---
-        contact_label = labels_left[1]  # "CONTATO:"
-        label_left_padding = 2
-        contact_label_w = canvas.stringWidth(contact_label, self.FONT_BOLD, label_font)
-        divider_gap_after_label = 2.0
-        divider_x_common = col_x0 + label_left_padding + contact_label_w + divider_gap_after_label
-
-        # desenha o divisor vertical do bloco esquerdo EXATAMENTE de y_row0 até y_row3
-        canvas.setLineWidth(self.LINE_WIDTH)
-        canvas.setStrokeColor(colors.black)
-        canvas.line(divider_x_common, y_row3, divider_x_common, y_row0)
-
-        # restaura/divisores do lado direito
-        offset_left_line = 2.0
-        offset_right_line = 4.0
+        label_font = self.label_font
+        value_font = self.value_font
 
-        def clamp_x(x):
-            return max(left_x, min(right_x, x))
-
-        x_vert_1 = clamp_x(col_x2 + offset_left_line)
-        x_vert_2 = clamp_x(col_x3 + offset_right_line)
-        canvas.line(x_vert_1, y_row3, x_vert_1, y_row0)
-        canvas.line(x_vert_2, y_row3, x_vert_2, y_row0)
-
-        # desenha a linha divisória central (igual ao divisor comum)
-        divider_x_common = clamp_x(divider_x_common)
-        canvas.line(divider_x_common, y_row3, divider_x_common, y_row0)
+        # divisor central já limitado à área do header (linhas desenhadas no path acima)
+        divider_x_common = self._divider_x_clamped
 
         # start x where left-value text should begin (a partir do divisor comum)
         value_gap_after_divider = 2
-        value_start_base = divider_x_common + value_gap_after_divider
-
+        value_start_x = divider_x_common + value_gap_after_divider
+        _left_available = max(10, (col_x2) - value_start_x - 2)
+        _right_available = max(10, max_width)
+
+        label_x = col_x0 + 2
+        label_x_r = col_x2 + right_label_padding
+        value_x = col_x3 + right_value_padding
+
+        # monta (x, y, texto) de rótulos e valores antes de desenhar, para trocar de fonte
+        # só duas vezes por página em vez de quatro por linha
+        labels = []
+        values = []
         for i in range(3):
-            top = rows_y[i]
-            bottom = rows_y[i + 1]
-            center_y = (top + bottom) / 2.0 - 3
-
-            # LABEL (esquerda)
-            canvas.setFont(self.FONT_BOLD, label_font)
-            canvas.setFillColor(colors.black)
-            _label_text = (labels_left[i] or '').strip()
-
-            label_left_padding = 2
-            label_x = col_x0 + label_left_padding
-            _label_max_w = max(8, (col_x2) - label_x - 6)
-            # truncamento com reticências (mantém lógica anterior)
-            if canvas.stringWidth(_label_text, self.FONT_BOLD, label_font) > _label_max_w:
-                while _label_text and canvas.stringWidth(_label_text + '…', self.FONT_BOLD, label_font) > _label_max_w:
-                    _label_text = _label_text[:-1]
-                _label_text = (_label_text + '…') if _label_text else ''
-            canvas.drawString(label_x, center_y, _label_text)
-
-            # VALOR ESQUERDO
-            canvas.setFont(self.FONT_REGULAR, value_font)
+            center_y = (rows_y[i] + rows_y[i + 1]) / 2.0 - 3
+            # rótulo esquerdo já truncado em __init__
+            labels.append((label_x, center_y, self._labels_left_fit[i]))
+            labels.append((label_x_r, center_y, LABELS_RIGHT[i]))
             _left_value_text = (values_left[i] or '').strip()
-            value_start_x = value_start_base
-            _left_available = max(10, (col_x2) - value_start_x - 2)
-
-            text_to_draw = _left_value_text or ''
-            if canvas.stringWidth(text_to_draw, self.FONT_REGULAR, value_font) > _left_available:
-                while text_to_draw and canvas.stringWidth(text_to_draw + '…', self.FONT_REGULAR, value_font) > _left_available:
-                    text_to_draw = text_to_draw[:-1]
-                text_to_draw = (text_to_draw + '…') if text_to_draw else ''
-
-            canvas.drawString(value_start_x, center_y, text_to_draw)
-
-            # coluna direita
-            canvas.setFont(self.FONT_BOLD, label_font)
-            canvas.drawString(col_x2 + right_label_padding, center_y, labels_right[i])
-            canvas.setFont(self.FONT_REGULAR, value_font)
-
-            value_text = (values_right[i] or '')
-            _right_available = max(10, max_width)
-
-            text_to_draw_r = value_text or ''
-            if canvas.stringWidth(text_to_draw_r, self.FONT_REGULAR, value_font) > _right_available:
-                while text_to_draw_r and canvas.stringWidth(text_to_draw_r + '…', self.FONT_REGULAR, value_font) > _right_available:
-                    text_to_draw_r = text_to_draw_r[:-1]
-                text_to_draw_r = (text_to_draw_r + '…') if text_to_draw_r else ''
-
-            value_x = col_x3 + right_value_padding
-            canvas.drawString(value_x, center_y, text_to_draw_r)
-            canvas.setFont(self.FONT_REGULAR, value_font)
+            values.append((value_start_x, center_y,
+                           self._truncate(_left_value_text, self.FONT_REGULAR, value_font, _left_available)))
+            values.append((value_x, center_y,
+                           self._truncate(values_right[i] or '', self.FONT_REGULAR, value_font, _right_available)))
+
+        canvas.setFillColor(colors.black)
+        canvas.setFont(self.FONT_BOLD, label_font)
+        for x, y, txt in labels:
+            canvas.drawString(x, y, txt)
+        canvas.setFont(self.FONT_REGULAR, value_font)
+        for x, y, txt in values:
+            canvas.drawString(x, y, txt)
 
         canvas.restoreState()
@@ -1,9 +1,15 @@
 # core/pdf/pdf_service.py
 import io
+import os
+import copy
+import json
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Spacer
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 
@@ -12,12 +18,101 @@ from core.utils import format_date_br
 
 from .font_manager import FontManager
 from .styles_builder import make_styles
+from .tables_builder import sanitize_for_paragraph
 from .utils import find_logo_bytes, _norm_text
 from .header_drawer import HeaderDrawer
 from .footer_drawer import FooterDrawer
 from .story_builder import StoryBuilder
 
 
+# dimensões lidas do config em polegadas: (atributo, chave no config, default em polegadas)
+_DIM_DEFAULTS = (
+    ('MARGIN', 'PAGE_MARGIN_INCH', 0.35),
+    ('header_row0', 'HEADER_ROW0_INCH', 0.22),
+    ('header_row', 'HEADER_ROW_INCH', 0.26),
+    ('square_side', 'SQUARE_SIDE_INCH', 1.18),
+    ('sig_header_h_base', 'SIG_HEADER_H_INCH', 0.24),
+    ('sig_area_h_base', 'SIG_AREA_H_INCH', 0.6),
+    ('footer_h_base', 'FOOTER_H_INCH', 0.24),
+    ('preserved_top_margin_base', 'PRESERVED_TOP_MARGIN_INCH', 0.25),
+    ('preserved_bottom_margin_base', 'PRESERVED_BOTTOM_MARGIN_INCH', 0.12),
+)
+
+
+def _inch_or_default(config, name, default_inch):
+    """Valor do config (em polegadas) convertido para pts; default se ausente/inválido."""
+    v = getattr(config, name, None)
+    if v is None:
+        return default_inch * inch
+    try:
+        return float(v) * inch
+    except Exception:
+        return default_inch * inch
+
+
+# nome de arquivo: espaço -> '_', barra -> '-' (uma passada só)
+_FN_SANITIZE_TABLE = str.maketrans({' ': '_', '/': '-'})
+
+
+def _get_field(obj, key):
+    """Lê `key` de um dict ou de um atributo (ReportRequest)."""
+    return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+
+class _PDFSink:
+    """
+    Destino do doc.build: o ReportLab grava o PDF inteiro num único write(), então
+    só guardamos a referência aos bytes (sem crescer/copiar um BytesIO).
+    """
+    __slots__ = ('chunks',)
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+        return len(data)
+
+    def getvalue(self):
+        return b''.join(self.chunks)
+
+
+def _write_to_stream(out_stream, data):
+    """Grava bytes já prontos em out_stream (caminho ou arquivo binário), como o doc.build faria."""
+    if isinstance(out_stream, (str, os.PathLike)):
+        with open(out_stream, 'wb') as fh:
+            fh.write(data)
+    else:
+        out_stream.write(data)
+
+
+class _PageCallback:
+    """onPage do PageTemplate: header + footer + número da página de um relatório."""
+    __slots__ = ('footer', 'header', 'report_request', 'logo_bytes', 'usable_w', 'marg')
+
+    def __init__(self, footer, header, report_request, logo_bytes, usable_w, marg):
+        self.footer = footer
+        self.header = header
+        self.report_request = report_request
+        self.logo_bytes = logo_bytes
+        self.usable_w = usable_w
+        self.marg = marg
+
+    def __call__(self, canvas, doc_local):
+        self.footer.on_page_template(
+            canvas,
+            doc_local,
+            self._draw_header,
+            self.logo_bytes,
+            ensure_upper_safe,
+            self.usable_w,
+            self.marg
+        )
+
+    def _draw_header(self, c, d, lb, eu):
+        return self.header.draw_header(c, d, lb, self.report_request, eu)
+
+
 class PDFService:
     def __init__(self, config):
         self.config = config
@@ -51,79 +146,36 @@ class PDFService:
         self.FONT_REGULAR = fm.FONT_REGULAR
         self.FONT_BOLD = fm.FONT_BOLD
 
-        # --- page / header / footer dimensions (configurable) ---
-        # margins (in points) - values expressed as inches in config are converted when user sets in inches
-        def _inch_or_val(name, default_inch):
-            v = getattr(self.config, name, None)
-            if v is None:
-                return default_inch * inch
-            try:
-                # if user provided a number assume it's inches; if already in pts, they can pass float<1 and be multiplied: keep convention simple
-                return float(v) * inch
-            except Exception:
-                try:
-                    return float(v)
-                except Exception:
-                    return default_inch * inch
-
-        # main margin
-        self.MARGIN = _inch_or_val('PAGE_MARGIN_INCH', 0.35)
+        # --- page / header / footer dimensions (configurable, em polegadas no config) ---
+        for attr, name, default_inch in _DIM_DEFAULTS:
+            setattr(self, attr, _inch_or_default(self.config, name, default_inch))
 
-        # header rows & heights (defaults preserved)
-        self.header_row0 = _inch_or_val('HEADER_ROW0_INCH', 0.22)
-        self.header_row = _inch_or_val('HEADER_ROW_INCH', 0.26)
+        # header height (defaults preserved)
         self.header_height_base = float(getattr(self.config, 'HEADER_HEIGHT_BASE', (self.header_row0 + self.header_row * 3)))
 
-        # square (logo/signature) dimension used in story builder
-        self.square_side = _inch_or_val('SQUARE_SIDE_INCH', 1.18)
-
-        # signature/footer sizes
-        self.sig_header_h_base = _inch_or_val('SIG_HEADER_H_INCH', 0.24)
-        self.sig_area_h_base = _inch_or_val('SIG_AREA_H_INCH', 0.6)
-        self.footer_h_base = _inch_or_val('FOOTER_H_INCH', 0.24)
+        # footer total (assinaturas + rodapé)
         self.footer_total_height_base = float(getattr(self.config, 'FOOTER_TOTAL_HEIGHT_BASE',
                                                       (self.footer_h_base + self.sig_header_h_base + self.sig_area_h_base)))
 
-        # optional top/bottom preserved margins (inches)
-        self.preserved_top_margin_base = _inch_or_val('PRESERVED_TOP_MARGIN_INCH', 0.25)
-        self.preserved_bottom_margin_base = _inch_or_val('PRESERVED_BOTTOM_MARGIN_INCH', 0.12)
-
         # top padding inside frame (pts)
         self.TOP_PADDING = int(getattr(self.config, 'TOP_PADDING', 4))
 
-    def estimate_height(self, flowables, avail_width, avail_height):
-        h = 0.0
-        from reportlab.platypus import Spacer as _Spacer
-        for f in flowables:
-            try:
-                if isinstance(f, _Spacer):
-                    h += f.height
-                    continue
-                w, fh = f.wrap(avail_width, avail_height)
-                h += fh
-            except Exception:
-                h += 10
-        return h
+        # (data, 'YYYYMMDD') usada em get_filename
+        self._fn_date = None
 
-    def sanitize_for_paragraph(self, text):
-        try:
-            if text is None:
-                return ''
-            txt = str(text)
-            txt = txt.replace('\r\n', '\n').replace('\r', '\n')
-            from xml.sax.saxutils import escape as xml_escape
-            escaped = xml_escape(txt)
-            safe = escaped.replace('\n', '<br/>')
-            return safe
-        except Exception:
-            try:
-                from xml.sax.saxutils import escape as xml_escape
-                return xml_escape(str(text or '')).replace('\n', '<br/>')
-            except Exception:
-                return ''
+        # PDFs já gerados, indexados pelo digest das entradas (montado em _build_shared)
+        self._pdf_cache = OrderedDict()
+        self._pdf_cache_lock = threading.Lock()
 
-    def generate_pdf(self, report_request, atividades_list, equipments_list, saved_report_id):
-        pdf_buffer = io.BytesIO()
+        # objetos derivados só do config: montados uma vez e reaproveitados entre relatórios
+        self._shared_for = None
+        self._build_shared()
+
+    def _build_shared(self):
+        """
+        Monta a geometria da página, estilos, logo, header e footer, que dependem só
+        do config. generate_pdf remonta apenas se self.config for trocado.
+        """
         PAGE_SIZE = letter
         PAGE_W, PAGE_H = PAGE_SIZE
 
@@ -140,8 +192,11 @@ class PDFService:
         frame_bottom = preserved_bottom_margin + self.footer_total_height_base
         frame_height = max(1.0 * inch, frame_top - frame_bottom)
 
+        self._layout = (PAGE_SIZE, MARG, usable_w, preserved_top_margin, preserved_bottom_margin,
+                        frame_bottom, frame_height)
+
         # styles (pass config sizes and fonts)
-        styles, ps, pm = make_styles(
+        self._styles, self._ps, self._pm = make_styles(
             self.config,
             self.FONT_REGULAR,
             self.FONT_BOLD,
@@ -152,11 +207,8 @@ class PDFService:
             self.BASE_VALUE_FONT_SIZE
         )
 
-        # utils + logo
-        logo_bytes = find_logo_bytes(self.config)
-
         # builders / drawers: pass config-driven sizes & visual params
-        header = HeaderDrawer(
+        self._header = HeaderDrawer(
             self.config,
             self.FONT_REGULAR,
             self.FONT_BOLD,
@@ -172,7 +224,7 @@ class PDFService:
             self.square_side
         )
 
-        footer = FooterDrawer(
+        self._footer = FooterDrawer(
             self.BASE_VALUE_FONT_SIZE,
             self.BASE_LABEL_FONT_SIZE,
             self.LINE_WIDTH,
@@ -181,6 +233,97 @@ class PDFService:
             self.sig_area_h_base,
             self.footer_h_base
         )
+        # PDFs em cache foram gerados com o config anterior: descarta (0 desativa)
+        with self._pdf_cache_lock:
+            self.PDF_CACHE_SIZE = max(0, int(getattr(self.config, 'PDF_CACHE_SIZE', 0)))
+            self._pdf_cache.clear()
+
+        self._shared_for = self.config
+
+    def estimate_height(self, flowables, avail_width, avail_height):
+        h = 0.0
+        for f in flowables:
+            try:
+                if isinstance(f, Spacer):
+                    h += f.height
+                    continue
+                w, fh = f.wrap(avail_width, avail_height)
+                h += fh
+            except Exception:
+                h += 10
+        return h
+
+    def sanitize_for_paragraph(self, text):
+        # mesma regra (e mesmo cache) usada nas tabelas
+        return sanitize_for_paragraph(text)
+
+    def _pdf_cache_key(self, report_request, atividades_list, equipments_list, logo_bytes):
+        """
+        BLAKE2b do JSON canônico das entradas + bytes do logo. O saved_report_id não
+        aparece no PDF e fica de fora. Retorna None se algo não for serializável.
+        """
+        try:
+            rr = report_request.model_dump() if hasattr(report_request, 'model_dump') else report_request
+            canonical = json.dumps([rr, atividades_list, equipments_list], sort_keys=True,
+                                   separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        except Exception:
+            return None
+        h = hashlib.blake2b(canonical, digest_size=16)
+        if logo_bytes:
+            h.update(logo_bytes)
+        return h.digest()
+
+    def generate_pdf(self, report_request, atividades_list, equipments_list, saved_report_id, out_buffer=None,
+                     out_stream=None):
+        """
+        Gera o PDF do relatório. Retorna (saída, saved_report_id). Destinos possíveis
+        (no máximo um; passar os dois levanta ValueError):
+        - nenhum: devolve um BytesIO novo, na posição 0;
+        - `out_buffer` (BytesIO): é esvaziado, recebe o PDF e volta na posição 0, pronto
+          para leitura; útil para quem gera vários PDFs em sequência;
+        - `out_stream` (caminho ou arquivo binário, que pode não ser seekable): recebe o PDF
+          direto, sem cópia em memória, e volta como foi escrito (posição no fim); não é
+          rebobinado porque pode ser um stream de resposta.
+        Com PDF_CACHE_SIZE > 0 (desligado por padrão) e as mesmas entradas, o PDF sai do
+        cache em memória sem passar pelo ReportLab, para qualquer destino; ele mantém o
+        CreationDate e o /ID da primeira geração. Só os PDFs gerados em memória (sem
+        out_stream) entram no cache, já que o out_stream não guarda os bytes.
+        """
+        if out_buffer is not None and out_stream is not None:
+            raise ValueError('generate_pdf: informe out_buffer ou out_stream, não os dois')
+        if self._shared_for is not self.config:
+            self._build_shared()
+        PAGE_SIZE, MARG, usable_w, preserved_top_margin, preserved_bottom_margin, frame_bottom, frame_height = self._layout
+        styles, ps, pm = self._styles, self._ps, self._pm
+        # logo: leitura em disco em cache por mtime (core/pdf/utils.py), aqui só um stat
+        logo_bytes = find_logo_bytes(self.config)
+
+        cache_key = None
+        if self.PDF_CACHE_SIZE:
+            cache_key = self._pdf_cache_key(report_request, atividades_list, equipments_list, logo_bytes)
+            if cache_key is not None:
+                with self._pdf_cache_lock:
+                    data = self._pdf_cache.get(cache_key)
+                    if data is not None:
+                        self._pdf_cache.move_to_end(cache_key)
+                if data is not None:
+                    if out_stream is not None:
+                        _write_to_stream(out_stream, data)
+                        return out_stream, saved_report_id
+                    if out_buffer is not None:
+                        out_buffer.seek(0)
+                        out_buffer.truncate(0)
+                        out_buffer.write(data)
+                        out_buffer.seek(0)
+                        return out_buffer, saved_report_id
+                    return io.BytesIO(data), saved_report_id
+
+        footer = self._footer
+
+        # cópia rasa por relatório: os valores do header ficam isolados entre requisições
+        # concorrentes e os caches (larguras, logo, path) continuam compartilhados
+        header = copy.copy(self._header)
+        header.prepare_report(report_request, ensure_upper_safe)
 
         # story builder
         story_builder = StoryBuilder(
@@ -201,8 +344,16 @@ class PDFService:
         story = story_builder.build_story(report_request, atividades_list, equipments_list, frame_height=frame_height)
 
         # document setup
+        if out_stream is not None:
+            pdf_sink = out_stream
+        elif out_buffer is not None:
+            out_buffer.seek(0)
+            out_buffer.truncate(0)
+            pdf_sink = out_buffer
+        else:
+            pdf_sink = _PDFSink()
         doc = BaseDocTemplate(
-            pdf_buffer,
+            pdf_sink,
             pagesize=PAGE_SIZE,
             leftMargin=MARG,
             rightMargin=MARG,
@@ -223,25 +374,38 @@ class PDFService:
             id='content_frame'
         )
 
-        def on_page_template(canvas, doc_local):
-            footer.on_page_template(
-                canvas,
-                doc_local,
-                lambda c, d, lb, eu: header.draw_header(c, d, lb, report_request, eu),
-                logo_bytes,
-                ensure_upper_safe,
-                usable_w,
-                MARG
-            )
+        on_page_template = _PageCallback(footer, header, report_request, logo_bytes, usable_w, MARG)
 
         template = PageTemplate(id='normal', frames=[content_frame], onPage=on_page_template)
         doc.addPageTemplates([template])
 
         # build PDF
         doc.build(story)
-        pdf_buffer.seek(0)
+        if out_stream is not None:
+            return out_stream, saved_report_id
+
+        data = out_buffer.getvalue() if out_buffer is not None else pdf_sink.getvalue()
+        if cache_key is not None:
+            with self._pdf_cache_lock:
+                self._pdf_cache[cache_key] = data
+                while len(self._pdf_cache) > self.PDF_CACHE_SIZE:
+                    self._pdf_cache.popitem(last=False)
+
+        if out_buffer is not None:
+            out_buffer.seek(0)
+            return out_buffer, saved_report_id
+        # BytesIO criado a partir de bytes compartilha o buffer até ser modificado
+        pdf_buffer = io.BytesIO(data)
         return pdf_buffer, saved_report_id
 
+    def _filename_date(self):
+        """Data (UTC) do nome do arquivo, formatada uma vez por dia."""
+        today = datetime.utcnow().date()
+        cached = self._fn_date
+        if cached is None or cached[0] != today:
+            cached = self._fn_date = (today, today.strftime('%Y%m%d'))
+        return cached[1]
+
     def get_filename(self, report_request, equipments_list):
         equip_name_for_file = ''
         try:
@@ -253,19 +417,17 @@ class PDFService:
                     equip_name_for_file = str(e0)
             if not equip_name_for_file:
                 # support attribute or dict-like request
-                equip_name_for_file = getattr(report_request, 'EQUIPAMENTO', '') or (report_request.get('EQUIPAMENTO') if isinstance(report_request, dict) else '')
-            equip_name_for_file = str(equip_name_for_file).strip().replace(' ', '_').replace('/', '-')
+                equip_name_for_file = _get_field(report_request, 'EQUIPAMENTO') or ''
+            equip_name_for_file = str(equip_name_for_file).strip().translate(_FN_SANITIZE_TABLE)
         except Exception:
             equip_name_for_file = ''
 
-        safe_ship = ''
         try:
-            safe_ship = (getattr(report_request, 'NAVIO', None) or (report_request.get('NAVIO') if isinstance(report_request, dict) else None) or 'Geral').replace(' ', '_')
+            safe_ship = (_get_field(report_request, 'NAVIO') or 'Geral').replace(' ', '_')
         except Exception:
             safe_ship = 'Geral'
 
-        date_str = datetime.utcnow().strftime('%Y%m%d')
-        filename = f"RS_{date_str}_{safe_ship}"
+        filename = f"RS_{self._filename_date()}_{safe_ship}"
         if equip_name_for_file:
             filename = f"{filename}_{equip_name_for_file}"
         filename = f"{filename}.pdf"
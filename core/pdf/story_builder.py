@@ -33,7 +33,8 @@ class StoryBuilder:
         story_local = []
 
         # spacer inicial bem pequeno (evita deslocamentos desnecessários)
-        story_local.append(Spacer(1, 1))  # 1 pt
+        top_spacer = Spacer(1, 1)  # 1 pt
+        story_local.append(top_spacer)
 
         # equipment
         equip_table = self.equip_builder.build(report_request, equipments_list, self.usable_w)
@@ -43,31 +44,18 @@ class StoryBuilder:
         small_spacer = Spacer(1, 2)  # 2 pts
         story_local.append(small_spacer)
 
-        # MEDIR quanto já foi usado na página (somente os elementos acima)
-        used_top_h = 0.0
+        # MEDIR quanto já foi usado na página (somente os elementos acima).
+        # Os tipos são conhecidos: Spacers têm altura fixa, só a tabela precisa de wrap.
         # se frame_height for None, passamos um valor grande para wrap (wrap requer um max height)
         wrap_max_h = frame_height if frame_height is not None else 10000.0
 
-        for f in story_local:
-            try:
-                # se o objeto tem wrap (Table, Paragraph, etc.), usamos wrap para obter altura real
-                if hasattr(f, 'wrap'):
-                    try:
-                        _, h = f.wrap(self.usable_w, wrap_max_h)
-                        used_top_h += float(h or 0.0)
-                        continue
-                    except Exception:
-                        pass
-                # se é Spacer (ou similar) usamos atributo height
-                if hasattr(f, 'height'):
-                    try:
-                        used_top_h += float(getattr(f, 'height') or 0.0)
-                        continue
-                    except Exception:
-                        pass
-            except Exception:
-                # em casos estranhos, ignora e segue
-                continue
+        used_top_h = float(top_spacer.height)
+        try:
+            _, h = equip_table.wrap(self.usable_w, wrap_max_h)
+            used_top_h += float(h or 0.0)
+        except Exception:
+            pass
+        used_top_h += float(small_spacer.height)
 
         # garantir valor inteiro para satisfazer o tipo esperado e evitar truncamento
         page_top_offset = int(math.ceil(used_top_h)) if used_top_h else 0
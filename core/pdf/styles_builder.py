@@ -17,22 +17,26 @@ def make_styles(config, font_regular, font_bold, small_pad, med_pad, base_title_
         except Exception:
             return float(fallback)
 
+    # limites de fonte lidos uma única vez
+    min_fs = float(getattr(config, 'MIN_FONT_SIZE', 6.0))
+    max_fs = float(getattr(config, 'MAX_FONT_SIZE', 72.0))
+
     # bases com limites
-    base_title = max(getattr(config, 'MIN_FONT_SIZE', 6.0), _num(base_title_sz, 8.0))
-    base_label = max(getattr(config, 'MIN_FONT_SIZE', 6.0), _num(base_label_sz, 8.0))
-    base_value = max(getattr(config, 'MIN_FONT_SIZE', 6.0), _num(base_value_sz, 7.0))
+    base_title = max(min_fs, _num(base_title_sz, 8.0))
+    base_label = max(min_fs, _num(base_label_sz, 8.0))
+    base_value = max(min_fs, _num(base_value_sz, 7.0))
 
     resp_mult = _num(getattr(config, 'RESPONSE_VALUE_MULTIPLIER', 1.0), 1.0)
     label_mult = _num(getattr(config, 'LABEL_VALUE_MULTIPLIER', 1.0), 1.0)
 
-    response_sz = max(getattr(config, 'MIN_FONT_SIZE', 6.0),
-                      min(getattr(config, 'MAX_FONT_SIZE', 72.0), float(base_value) * float(resp_mult)))
+    response_sz = max(min_fs,
+                      min(max_fs, float(base_value) * float(resp_mult)))
 
-    label_sz = max(getattr(config, 'MIN_FONT_SIZE', 6.0),
-                   min(getattr(config, 'MAX_FONT_SIZE', 72.0), float(base_label) * float(label_mult)))
+    label_sz = max(min_fs,
+                   min(max_fs, float(base_label) * float(label_mult)))
 
-    title_sz = max(getattr(config, 'MIN_FONT_SIZE', 6.0),
-                   min(getattr(config, 'MAX_FONT_SIZE', 72.0), float(base_title)))
+    title_sz = max(min_fs,
+                   min(max_fs, float(base_title)))
 
     pad_small = max(0, int(small_pad if small_pad is not None else getattr(config, 'SMALL_PAD', 2)))
     pad_med = max(0, int(med_pad if med_pad is not None else getattr(config, 'MED_PAD', 3)))
@@ -144,12 +148,12 @@ def make_styles(config, font_regular, font_bold, small_pad, med_pad, base_title_
 
         # compute size with priority: override > use_resp*mult > fallback service_mult
         if override_eff and float(override_eff) > 0:
-            svc = max(getattr(config, 'MIN_FONT_SIZE', 6.0), float(override_eff))
+            svc = max(min_fs, float(override_eff))
         elif use_resp_eff:
-            svc = max(getattr(config, 'MIN_FONT_SIZE', 6.0), float(response_sz) * float(mult_eff))
+            svc = max(min_fs, float(response_sz) * float(mult_eff))
         else:
             svc_mult = _num(getattr(config, 'SERVICE_VALUE_MULTIPLIER', 1.0), 1.0)
-            svc = max(getattr(config, 'MIN_FONT_SIZE', 6.0), float(response_sz) * float(svc_mult))
+            svc = max(min_fs, float(response_sz) * float(svc_mult))
 
         svc = max(8.2, svc)
         # resolve font name: section font or default regular
@@ -3,18 +3,43 @@ from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.lib.styles import ParagraphStyle
 from xml.sax.saxutils import escape as xml_escape
+from functools import lru_cache
+import re
 from core.normalizers import ensure_upper_safe
 
+# textos curtos (células, nomes, rótulos) se repetem muito; os longos vão direto
+_SANITIZE_CACHE_MAX_LEN = 512
+# caracteres que exigem escape/conversão; sem eles o texto já é seguro
+_SANITIZE_NEEDS_RE = re.compile(r'[&<>\r\n]')
+_SANITIZE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '\r': '<br/>',
+    '\n': '<br/>',
+})
+
+
+def _sanitize_str(txt):
+    if not _SANITIZE_NEEDS_RE.search(txt):
+        return txt
+    # CRLF vira uma quebra só; depois escape XML e quebras em uma única passada
+    return txt.replace('\r\n', '\n').translate(_SANITIZE_TABLE)
+
+
+_sanitize_str_cached = lru_cache(maxsize=4096)(_sanitize_str)
+
 
 def sanitize_for_paragraph(text):
     try:
         if text is None:
             return ''
         txt = str(text)
-        txt = txt.replace('\r\n', '\n').replace('\r', '\n')
-        escaped = xml_escape(txt)
-        safe = escaped.replace('\n', '<br/>')
-        return safe
+        if not txt:
+            return ''
+        if len(txt) <= _SANITIZE_CACHE_MAX_LEN:
+            return _sanitize_str_cached(txt)
+        return _sanitize_str(txt)
     except Exception:
         try:
             return xml_escape(str(text or '')).replace('\n', '<br/>')
@@ -31,42 +56,77 @@ def shrink_paragraph_to_fit(text, base_style, max_w, max_h, min_font=6):
      - garante leading suficiente.
     """
     txt = sanitize_for_paragraph(str(text or ''))
+    # o mesmo texto na mesma caixa sempre escolhe o mesmo estilo: memoiza a escolha
+    # (não o Paragraph, que é mutável) para textos curtos como nomes, datas e vazios
+    if len(txt) <= _SANITIZE_CACHE_MAX_LEN:
+        try:
+            return Paragraph(txt, _fit_style_cached(txt, base_style, max_w, max_h, min_font))
+        except TypeError:
+            pass
+    return Paragraph(txt, _fit_style(txt, base_style, max_w, max_h, min_font))
+
+
+def _fit_style(txt, base_style, max_w, max_h, min_font):
+    """Retorna o estilo (original ou reduzido) com o qual txt cabe em max_w x max_h."""
     try:
         # usar uma cópia do estilo base para não modificar o original
-        s_try = ParagraphStyle(name="tmp_base", parent=base_style)
-        s_try.wordWrap = getattr(base_style, "wordWrap", "LTR") or "LTR"
+        s_try = _base_style_copy(base_style)
         para = Paragraph(txt, s_try)
         w, h = para.wrap(max_w, max_h)
         if h <= max_h:
-            return para
+            return s_try
     except Exception:
         pass
 
     orig_size = getattr(base_style, "fontSize", 8.2)
-    size = orig_size
 
-    # decremento suave sem nunca inserir reticências
+    # decremento suave sem nunca inserir reticências. A busca é linear de propósito:
+    # a altura do wrap nem sempre cai junto com a fonte (quebra de palavras, recuo da
+    # primeira linha), então o primeiro tamanho que cabe precisa ser achado em ordem
+    size = orig_size
     while size >= min_font:
-        tmp_style = ParagraphStyle(name="tmp_shrink", parent=base_style)
-        tmp_style.wordWrap = getattr(base_style, "wordWrap", "LTR") or "LTR"
-        tmp_style.fontSize = size
-        tmp_style.leading = max( (size * 1.06), (size + 1) )
         try:
-            para_try = Paragraph(txt, tmp_style)
-            w, h = para_try.wrap(max_w, max_h)
+            style_try = _shrink_style(base_style, size)
+            w, h = Paragraph(txt, style_try).wrap(max_w, max_h)
             if h <= max_h:
-                return para_try
+                return style_try
         except Exception:
             pass
         size -= 0.5
 
-    # se não coube mesmo reduzindo até min_font -> devolve Paragraph com min_font
-    tmp_style = ParagraphStyle(name="tmp_shrink_min", parent=base_style)
+    # se não coube mesmo reduzindo até min_font -> estilo com min_font
+    return _shrink_style(base_style, min_font, "tmp_shrink_min")
+
+
+_fit_style_cached = lru_cache(maxsize=4096)(_fit_style)
+
+
+@lru_cache(maxsize=64)
+def _base_style_copy(base_style):
+    s_try = ParagraphStyle(name="tmp_base", parent=base_style)
+    s_try.wordWrap = getattr(base_style, "wordWrap", "LTR") or "LTR"
+    return s_try
+
+
+@lru_cache(maxsize=256)
+def _shrink_style(base_style, size, name="tmp_shrink"):
+    """Estilo derivado de base_style com fontSize/leading reduzidos (reutilizado entre células)."""
+    tmp_style = ParagraphStyle(name=name, parent=base_style)
     tmp_style.wordWrap = getattr(base_style, "wordWrap", "LTR") or "LTR"
-    tmp_style.fontSize = min_font
-    tmp_style.leading = max((min_font * 1.06), (min_font + 1))
-    return Paragraph(txt, tmp_style)
+    tmp_style.fontSize = size
+    tmp_style.leading = max((size * 1.06), (size + 1))
+    return tmp_style
+
 
+def _make_tech_name(raw):
+    """Une o sobrenome ao resto do nome com espaço inseparável (não quebra no fim)."""
+    s = str(raw or '').strip()
+    if not s:
+        return ''
+    parts = s.split()
+    if len(parts) == 1:
+        return s
+    return ' '.join(parts[:-1]) + '\u00A0' + parts[-1]
 
 
 class EquipmentTableBuilder:
@@ -212,6 +272,11 @@ class ActivitiesTableBuilder:
         if col_widths:
             col_widths[-1] += diff2
 
+        # invariantes do laço de linhas: largura útil por coluna, estilo e altura máxima
+        inner_ws = tuple(w - 6 for w in col_widths)
+        style_resp = self.styles['response']
+        max_h_cell = 0.7 * inch
+
         header_cells = [
             Paragraph("DATA", self.styles['label_center']),
             Paragraph("HORA", self.styles['label_center']),
@@ -234,19 +299,23 @@ class ActivitiesTableBuilder:
 
             km_final = at.get('KM') or ''
 
-            at_lc = {}
-            if isinstance(at, dict):
+            # caminho rápido: atividades normalizadas trazem ORIGEM/DESTINO diretamente;
+            # só varre as chaves em minúsculas quando faltar algum dos dois
+            origem = at.get('ORIGEM') or at.get('origem')
+            destino = at.get('DESTINO') or at.get('destino')
+            if not (origem and destino) and isinstance(at, dict):
+                at_lc = {}
                 for k, v in at.items():
                     if v is None:
                         continue
                     at_lc[k.lower()] = v
 
-            origem = (at_lc.get('origem') or
-                    at_lc.get('local_origem') or
-                    at_lc.get('origem_local'))
-            destino = (at_lc.get('destino') or
-                    at_lc.get('local_destino') or
-                    at_lc.get('destino_local'))
+                origem = (at_lc.get('origem') or
+                        at_lc.get('local_origem') or
+                        at_lc.get('origem_local'))
+                destino = (at_lc.get('destino') or
+                        at_lc.get('local_destino') or
+                        at_lc.get('destino_local'))
 
             if origem and destino:
                 od = f"{(str(origem))} x {(str(destino))}"
@@ -261,27 +330,17 @@ class ActivitiesTableBuilder:
                 descricao_final = "Mão-de-Obra-Técnica"
                 km_final = ""
 
-            max_h_cell = 0.7 * inch
-            c0 = shrink_paragraph_to_fit(str(data_br or ''), self.styles['response'], col_widths[0] - 6, max_h_cell)
-            c1 = shrink_paragraph_to_fit(hora_comb, self.styles['response'], col_widths[1] - 6, max_h_cell)
-            c2 = shrink_paragraph_to_fit(tipo, self.styles['response'], col_widths[2] - 6, max_h_cell)
-            c3 = shrink_paragraph_to_fit(descricao_final, self.styles['response'], col_widths[3] - 6, max_h_cell)
-            c4 = shrink_paragraph_to_fit(km_final, self.styles['response'], col_widths[4] - 6, max_h_cell)
+            c0 = shrink_paragraph_to_fit(str(data_br or ''), style_resp, inner_ws[0], max_h_cell)
+            c1 = shrink_paragraph_to_fit(hora_comb, style_resp, inner_ws[1], max_h_cell)
+            c2 = shrink_paragraph_to_fit(tipo, style_resp, inner_ws[2], max_h_cell)
+            c3 = shrink_paragraph_to_fit(descricao_final, style_resp, inner_ws[3], max_h_cell)
+            c4 = shrink_paragraph_to_fit(km_final, style_resp, inner_ws[4], max_h_cell)
 
-            def make_tech_name(raw):
-                s = str(raw or '').strip()
-                if not s:
-                    return ''
-                parts = s.split()
-                if len(parts) == 1:
-                    return s
-                return ' '.join(parts[:-1]) + '\u00A0' + parts[-1]
+            nome_tec1 = _make_tech_name(at.get('TECNICO1'))
+            nome_tec2 = _make_tech_name(at.get('TECNICO2'))
 
-            nome_tec1 = make_tech_name(at.get('TECNICO1'))
-            nome_tec2 = make_tech_name(at.get('TECNICO2'))
-
-            c5 = shrink_paragraph_to_fit(nome_tec1, self.styles['response'], col_widths[5] - 6, max_h_cell)
-            c6 = shrink_paragraph_to_fit(nome_tec2, self.styles['response'], col_widths[6] - 6, max_h_cell)
+            c5 = shrink_paragraph_to_fit(nome_tec1, style_resp, inner_ws[5], max_h_cell)
+            c6 = shrink_paragraph_to_fit(nome_tec2, style_resp, inner_ws[6], max_h_cell)
 
             data.append([c0, c1, c2, c3, c4, c5, c6])
 
@@ -305,6 +364,11 @@ class ActivitiesTableBuilder:
         return activities_table
 
 
+# alturas dos títulos de seção (textos fixos): reaproveitadas entre relatórios
+_TITLE_H_CACHE = {}
+_TITLE_H_CACHE_MAX = 256
+
+
 class SectionsTableBuilder:
     def __init__(self, styles, gray, line_width, pad_small):
         self.styles = styles
@@ -329,14 +393,11 @@ class SectionsTableBuilder:
         safety_gap = 1.0
         cont_margin = 2.0
 
-        def make_title_table(text, minimal=False):
+        def make_title_style(minimal):
             """
             minimal=True -> título de CONTINUAÇÃO. Aumentamos um pouco o padding interno aqui
             para que o texto não fique colado nas bordas do campo.
             """
-            tpar = Paragraph(text, self.styles['label'])
-            tt = Table([[tpar]], colWidths=[usable_w])
-
             if minimal:
                 # pequeno aumento: garante espaço interno extra nas continuação
                 top_pad = 2
@@ -347,7 +408,7 @@ class SectionsTableBuilder:
                 bot_pad = 1
                 lr_pad = max(1, self.pad_small - 1)
 
-            tt.setStyle(TableStyle([
+            return TableStyle([
                 ('BACKGROUND', (0, 0), (-1, -1), self.GRAY),
                 ('BOX', (0, 0), (-1, -1), self.LINE_WIDTH, colors.black),
                 ('LEFTPADDING', (0, 0), (-1, -1), lr_pad),
@@ -355,7 +416,23 @@ class SectionsTableBuilder:
                 ('TOPPADDING', (0, 0), (-1, -1), top_pad),
                 ('BOTTOMPADDING', (0, 0), (-1, -1), bot_pad),
                 ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ]))
+            ])
+
+        # estilos de título e de conteúdo são iguais em todas as seções: criados uma vez por build
+        title_styles = {False: make_title_style(False), True: make_title_style(True)}
+        content_style = TableStyle([
+            ('BOX', (0, 0), (-1, -1), self.LINE_WIDTH, colors.black),
+            ('LEFTPADDING', (0, 0), (-1, -1), left_pad),
+            ('RIGHTPADDING', (0, 0), (-1, -1), right_pad),
+            ('TOPPADDING', (0, 0), (-1, -1), 1),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ])
+        label_style = self.styles['label']
+
+        def make_title_table(text, minimal=False):
+            tt = Table([[Paragraph(text, label_style)]], colWidths=[usable_w])
+            tt.setStyle(title_styles[minimal])
             return tt
 
         def estimate_row_height(paragraph_obj, w):
@@ -366,11 +443,18 @@ class SectionsTableBuilder:
                 ph = 0.0
             return ph + 2 + (self.LINE_WIDTH or 0.0)
 
-        def estimate_title_h(tbl):
-            try:
-                return tbl.wrap(usable_w, 10000)[1]
-            except Exception:
-                return 0.0
+        def estimate_title_h(tbl, text, minimal):
+            key = (text, minimal, usable_w, label_style, self.LINE_WIDTH, self.pad_small)
+            h = _TITLE_H_CACHE.get(key)
+            if h is None:
+                try:
+                    h = tbl.wrap(usable_w, 10000)[1]
+                except Exception:
+                    return 0.0
+                if len(_TITLE_H_CACHE) >= _TITLE_H_CACHE_MAX:
+                    _TITLE_H_CACHE.clear()
+                _TITLE_H_CACHE[key] = h
+            return h
 
         if estimate_height_fn is None:
             def est_fn(items, w, fh):
@@ -387,13 +471,13 @@ class SectionsTableBuilder:
         for idx, (title, content) in enumerate(sections, start=1):
             title_text = f"{idx}. {title}"
             title_tbl = make_title_table(title_text, minimal=False)
-            cont_title_tbl = make_title_table(f"{idx}. {title} - CONTINUAÇÃO", minimal=True)
+            cont_title_text = f"{idx}. {title} - CONTINUAÇÃO"
+            cont_title_tbl = make_title_table(cont_title_text, minimal=True)
 
             raw = str(content or '').strip()
-            if '\r\n\r\n' in raw or '\n\n' in raw:
-                paragraphs = [p.strip() for p in raw.replace('\r\n', '\n').split('\n\n') if p.strip()]
-            else:
-                paragraphs = [p.strip() for p in raw.replace('\r\n', '\n').split('\n') if p.strip()]
+            # linha em branco separa parágrafos; sem ela, cada linha é um parágrafo
+            sep = '\n\n' if ('\r\n\r\n' in raw or '\n\n' in raw) else '\n'
+            paragraphs = [p for p in (part.strip() for part in raw.replace('\r\n', '\n').split(sep)) if p]
 
             # garantir que sempre exista ao menos um "parágrafo" (simplifica o fluxo e evita títulos órfãos)
             if not paragraphs:
@@ -408,14 +492,7 @@ class SectionsTableBuilder:
             if frame_height is None:
                 rows = [[p] for p in paras]
                 content_tbl = Table(rows, colWidths=[usable_w], splitByRow=0)
-                content_tbl.setStyle(TableStyle([
-                    ('BOX', (0, 0), (-1, -1), self.LINE_WIDTH, colors.black),
-                    ('LEFTPADDING', (0, 0), (-1, -1), left_pad),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), right_pad),
-                    ('TOPPADDING', (0, 0), (-1, -1), 1),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
+                content_tbl.setStyle(content_style)
                 # Anexa diretamente — compactação máxima
                 flowables.append(title_tbl)
                 flowables.append(content_tbl)
@@ -425,8 +502,8 @@ class SectionsTableBuilder:
             i = 0
             first_chunk = True
             row_heights = [estimate_row_height(p, usable_w) for p in paras]
-            title_h_first = estimate_title_h(title_tbl)
-            title_h_cont = estimate_title_h(cont_title_tbl)
+            title_h_first = estimate_title_h(title_tbl, title_text, False)
+            title_h_cont = estimate_title_h(cont_title_tbl, cont_title_text, True)
 
             while i < len(paras):
                 curr_title = title_tbl if first_chunk else cont_title_tbl
@@ -452,14 +529,7 @@ class SectionsTableBuilder:
                         break
 
                 content_tbl = Table(chunk_rows, colWidths=[usable_w], splitByRow=0)
-                content_tbl.setStyle(TableStyle([
-                    ('BOX', (0, 0), (-1, -1), self.LINE_WIDTH, colors.black),
-                    ('LEFTPADDING', (0, 0), (-1, -1), left_pad),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), right_pad),
-                    ('TOPPADDING', (0, 0), (-1, -1), 1),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
+                content_tbl.setStyle(content_style)
 
                 # --------- comportamento seguro: evita título órfão e mantém compactação ----------
                 if first_chunk:
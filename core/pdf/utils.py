@@ -5,6 +5,7 @@ from pathlib import Path
 import unicodedata
 import re
 import string
+from functools import lru_cache
 
 def _norm_text(cell):
     try:
@@ -20,6 +21,26 @@ def _norm_text(cell):
     s = s.strip(" " + string.punctuation)
     return s.lower()
 
+@lru_cache(maxsize=8)
+def _read_bytes_cached(path_str, mtime_ns, size):
+    # mtime/tamanho entram na chave: arquivo alterado em disco -> nova leitura
+    return Path(path_str).read_bytes()
+
+
+def _read_file_bytes(p):
+    """Lê o arquivo `p` (com cache por mtime); levanta OSError se não existir."""
+    st = os.stat(p)
+    return _read_bytes_cached(str(p), st.st_mtime_ns, st.st_size)
+
+
+# diretórios derivados de __file__ não mudam: resolvidos uma vez na importação
+_PDF_DIR = Path(__file__).resolve().parent
+_MODULE_LOGO_CANDIDATES = (
+    _PDF_DIR.parent / 'static' / 'images' / 'logo.png',
+    _PDF_DIR.parent / 'static' / 'logo.png',
+)
+
+
 def find_logo_bytes(config_obj):
     logo_val = getattr(config_obj, 'LOGO_PATH', None)
     if isinstance(logo_val, (bytes, bytearray)):
@@ -30,30 +51,25 @@ def find_logo_bytes(config_obj):
     if logo_val and isinstance(logo_val, str):
         p = Path(logo_val)
         if not p.is_absolute():
-            base = Path(__file__).resolve().parent
-            p_try = (base / p).resolve()
-            if p_try.exists():
-                try:
-                    return p_try.read_bytes()
-                except Exception:
-                    pass
+            p_try = (_PDF_DIR / p).resolve()
+            try:
+                return _read_file_bytes(p_try)
+            except Exception:
+                pass
         try:
-            if p.exists():
-                return p.read_bytes()
+            return _read_file_bytes(p)
         except Exception:
             pass
-    base = Path(__file__).resolve().parent.parent
-    candidates = [
-        base / 'static' / 'images' / 'logo.png',
-        base / 'static' / 'logo.png',
-        Path.cwd() / 'static' / 'images' / 'logo.png',
-        Path.cwd() / 'static' / 'logo.png',
-        Path(__file__).resolve().parent / 'static' / 'images' / 'logo.png'
-    ]
+    cwd = Path.cwd()
+    candidates = (
+        *_MODULE_LOGO_CANDIDATES,
+        cwd / 'static' / 'images' / 'logo.png',
+        cwd / 'static' / 'logo.png',
+        _PDF_DIR / 'static' / 'images' / 'logo.png',
+    )
     for c in candidates:
         try:
-            if c.exists():
-                return c.read_bytes()
+            return _read_file_bytes(c)
         except Exception:
             pass
     try:
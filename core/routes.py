@@ -1,9 +1,8 @@
 from flask import request, send_file, render_template, jsonify, Response
-from functools import wraps
+from functools import wraps, lru_cache
 import requests
 from core.models import ReportRequest, Activity
-from core.normalizers import normalize_payload
-from core.pdf_service import PDFService
+from core.normalizers import normalize_payload, normalize_payload_cached
 from core.config import Config
 import json
 from datetime import datetime
@@ -20,9 +19,13 @@ def handle_errors(logger):
         return decorated
     return decorator
 
+@lru_cache(maxsize=None)
+def _get_pdf_service():
+    # import tardio: o ReportLab só é carregado quando o primeiro PDF é gerado
+    from core.pdf_service import PDFService
+    return PDFService(Config)
+
 def init_routes(app, db_manager, logger):
-    pdf_service = PDFService(Config)
-    
     @app.teardown_appcontext
     def close_db(error):
         db_manager.close_db(error)
@@ -180,7 +183,7 @@ def init_routes(app, db_manager, logger):
         if not form_data:
             return jsonify({'error': 'Payload JSON inválido ou ausente'}), 400
 
-        norm = normalize_payload(form_data)
+        norm = normalize_payload_cached(request.get_data(cache=True), form_data)
         report_id = norm.get('report_id') or form_data.get('report_id')
 
         report_request = ReportRequest(**norm)
@@ -266,6 +269,7 @@ def init_routes(app, db_manager, logger):
         import logging
         logger = logging.getLogger(__name__)
 
+        pdf_service = _get_pdf_service()
         res = pdf_service.generate_pdf(report_request, atividades_list, equipments_list, saved_report_id)
         if res is None:
             # registra e levanta um erro claro